@@ -1,20 +1,54 @@
 #!/usr/bin/env python3
 
 import argparse
-import copy
 import json
 import os
+import re
+import sys
+import time
 
 from tools.exceptions import ValidationError, PushoverNotificationError, TelegramNotificationError
-from tools.its import ImpfterminService
 from tools.kontaktdaten import decode_wochentag, encode_wochentag, get_kontaktdaten, \
-    validate_kontaktdaten, validate_datum
+    speichere_kontaktdaten, validate_kontaktdaten, validate_datum, validate_field
 from tools.utils import create_missing_dirs, get_current_version, \
-    get_latest_version, pushover_validation, remove_prefix, \
-    telegram_validation, unique, update_available
-from tools.chromium_downloader import check_chromium, download_chromium, check_webdriver, download_webdriver, current_platform
+    get_latest_version, pushover_validation, telegram_validation
 
 PATH = os.path.dirname(os.path.realpath(__file__))
+DEFAULT_KONTAKTDATEN_PATH = os.path.join(PATH, "data", "kontaktdaten.json")
+
+# Gültigkeitsdauer der zwischengespeicherten Versionsabfrage (in Sekunden)
+UPDATE_CHECK_TTL = 24 * 60 * 60
+
+# Antworten, die bei (y/n)-Abfragen als "nein" gewertet werden. Alle anderen
+# Eingaben gelten als "ja".
+_NO_ANSWERS = frozenset({"n", "N", "nein", "Nein", "NEIN"})
+
+# Ersetzt eine führende 0 oder ein fehlendes Präfix durch +49
+_PHONE_PREFIX_PATTERN = re.compile(r"^(?:\+49|0)?")
+
+# Kontaktdaten, die nur für die Terminsuche abgefragt werden: (Key, Prompt)
+_SEARCH_KONTAKT_FIELDS = (
+    ("anrede", "> Anrede (Frau/Herr/Kind/Divers): "),
+    ("vorname", "> Vorname: "),
+    ("nachname", "> Nachname: "),
+    ("strasse", "> Strasse (ohne Hausnummer): "),
+    ("hausnummer", "> Hausnummer: "),
+    ("plz", "> PLZ des Wohnorts: "),
+    ("ort", "> Wohnort: "),
+)
+
+# Benachrichtigungskanäle, die mit -n eingerichtet werden können:
+# (Key, Name, ((Key, Prompt), ...), Validierungsfunktion, Fehlertyp)
+_NOTIFICATION_CHANNELS = (
+    ("pushover", "Pushover",
+     (("app_token", "> Geben Sie den Pushover APP Token ein: "),
+      ("user_key", "> Geben Sie den Pushover User Key ein: ")),
+     pushover_validation, PushoverNotificationError),
+    ("telegram", "Telegram",
+     (("api_token", "> Geben Sie den Telegram API Token ein: "),
+      ("chat_id", "> Geben Sie die Telegram Chat ID ein: ")),
+     telegram_validation, TelegramNotificationError),
+)
 
 
 def update_kontaktdaten_interactive(
@@ -41,182 +75,188 @@ def update_kontaktdaten_interactive(
     # Werfe Fehler, falls die übergebenen Kontaktdaten bereits ungültig sind.
     validate_kontaktdaten(known_kontaktdaten)
 
-    kontaktdaten = copy.deepcopy(known_kontaktdaten)
+    # Kontaktdaten enthalten nur JSON-Typen, daher genügt zum Kopieren ein
+    # JSON-Roundtrip, der deutlich schneller ist als copy.deepcopy.
+    kontaktdaten = json.loads(json.dumps(known_kontaktdaten))
 
-    with open(filepath, 'w', encoding='utf-8') as file:
-        if "plz_impfzentren" not in kontaktdaten:
-            print(
-                "Mit einem Code kann in mehreren Impfzentren gleichzeitig nach einem Termin gesucht werden.\n"
-                "Eine Übersicht über die Gruppierung der Impfzentren findest du hier:\n"
-                "https://github.com/iamnotturner/vaccipy/wiki/Ein-Code-fuer-mehrere-Impfzentren\n\n"
-                "Trage nun die PLZ deines Impfzentrums ein. Für mehrere Impfzentren die PLZ's kommagetrennt nacheinander.\n"
-                "Beispiel: 68163, 69124, 69469\n")
-            input_kontaktdaten_key(kontaktdaten,
-                                   ["plz_impfzentren"],
-                                   "> PLZ's der Impfzentren: ",
-                                   lambda x: unique([plz.strip() for plz in x.split(",")]))
+    if "plz_impfzentren" not in kontaktdaten:
+        print(
+            "Mit einem Code kann in mehreren Impfzentren gleichzeitig nach einem Termin gesucht werden.\n"
+            "Eine Übersicht über die Gruppierung der Impfzentren findest du hier:\n"
+            "https://github.com/iamnotturner/vaccipy/wiki/Ein-Code-fuer-mehrere-Impfzentren\n\n"
+            "Trage nun die PLZ deines Impfzentrums ein. Für mehrere Impfzentren die PLZ's kommagetrennt nacheinander.\n"
+            "Beispiel: 68163, 69124, 69469\n")
+        input_kontaktdaten_key(kontaktdaten,
+                               ["plz_impfzentren"],
+                               "> PLZ's der Impfzentren: ",
+                               parse_kommagetrennt)
+        print()
+
+    if "codes" not in kontaktdaten and command == "search":
+        print(
+            "Bitte gebe jetzt die Vermittlungscodes passend zu den ausgewählten Impfzentren ein.\n"
+            "Beachte dabei, dass nur ein Vermittlungscode je Gruppierung benötigt wird.\n"
+            "Weitere Infos: https://github.com/iamnotturner/vaccipy/wiki/Ein-Code-fuer-mehrere-Impfzentren\n\n"
+            "Mehrere Vermittlungscodes müssen durch Kommas getrennt werden.\n"
+            "Beispiel: ABCD-1234-EFGH, ABCD-4321-EFGH, 1234-56AB-CDEF\n")
+        input_kontaktdaten_key(
+            kontaktdaten, ["codes"], "> Vermittlungscodes: ",
+            parse_kommagetrennt)
+        print()
+
+    if "kontakt" not in kontaktdaten:
+        kontaktdaten["kontakt"] = {}
+
+    if command == "search":
+        for key, prompt in _SEARCH_KONTAKT_FIELDS:
+            if key not in kontaktdaten["kontakt"]:
+                input_kontaktdaten_key(kontaktdaten, ["kontakt", key], prompt)
+
+    if "phone" not in kontaktdaten["kontakt"]:
+        input_kontaktdaten_key(
+            kontaktdaten,
+            ["kontakt", "phone"],
+            "> Telefonnummer: +49",
+            normalize_phone)
+
+    if "notificationChannel" not in kontaktdaten["kontakt"]:
+        kontaktdaten["kontakt"]["notificationChannel"] = "email"
+
+    if "notificationReceiver" not in kontaktdaten["kontakt"]:
+        input_kontaktdaten_key(
+            kontaktdaten, ["kontakt", "notificationReceiver"], "> Mail: ")
+
+    if configure_notifications:
+        if "notifications" not in kontaktdaten:
+            kontaktdaten["notifications"] = {}
+        for channel, name, prompts, validation, error in _NOTIFICATION_CHANNELS:
+            if channel not in kontaktdaten["notifications"]:
+                input_notification_channel(
+                    kontaktdaten, channel, name, prompts, validation, error)
+
+    if "zeitrahmen" not in kontaktdaten and command == "search":
+        kontaktdaten["zeitrahmen"] = {}
+        if input("> Zeitrahmen festlegen? (y/n): ").strip() not in _NO_ANSWERS:
             print()
-
-        if "codes" not in kontaktdaten and command == "search":
-            print(
-                "Bitte gebe jetzt die Vermittlungscodes passend zu den ausgewählten Impfzentren ein.\n"
-                "Beachte dabei, dass nur ein Vermittlungscode je Gruppierung benötigt wird.\n"
-                "Weitere Infos: https://github.com/iamnotturner/vaccipy/wiki/Ein-Code-fuer-mehrere-Impfzentren\n\n"
-                "Mehrere Vermittlungscodes müssen durch Kommas getrennt werden.\n"
-                "Beispiel: ABCD-1234-EFGH, ABCD-4321-EFGH, 1234-56AB-CDEF\n")
             input_kontaktdaten_key(
-                kontaktdaten, ["codes"], "> Vermittlungscodes: ",
-                lambda x: unique([code.strip() for code in x.split(",")]))
-            print()
-
-        if "kontakt" not in kontaktdaten:
-            kontaktdaten["kontakt"] = {}
-
-        if "anrede" not in kontaktdaten["kontakt"] and command == "search":
+                kontaktdaten, ["zeitrahmen", "einhalten_bei"],
+                "> Für welchen Impftermin soll der Zeitrahmen gelten? (1/2/beide): ")
             input_kontaktdaten_key(
-                kontaktdaten, ["kontakt", "anrede"], "> Anrede (Frau/Herr/Kind/Divers): ")
-
-        if "vorname" not in kontaktdaten["kontakt"] and command == "search":
+                kontaktdaten, ["zeitrahmen", "von_datum"],
+                "> Von Datum (Leer lassen zum Überspringen): ",
+                lambda x: x if x else None)  # Leeren String zu None umwandeln
             input_kontaktdaten_key(
-                kontaktdaten, ["kontakt", "vorname"], "> Vorname: ")
-
-        if "nachname" not in kontaktdaten["kontakt"] and command == "search":
+                kontaktdaten, ["zeitrahmen", "bis_datum"],
+                "> Bis Datum (Leer lassen zum Überspringen): ",
+                lambda x: x if x else None)  # Leeren String zu None umwandeln
             input_kontaktdaten_key(
-                kontaktdaten, ["kontakt", "nachname"], "> Nachname: ")
-
-        if "strasse" not in kontaktdaten["kontakt"] and command == "search":
+                kontaktdaten, ["zeitrahmen", "von_uhrzeit"],
+                "> Von Uhrzeit (Leer lassen zum Überspringen): ",
+                lambda x: x if x else None)  # Leeren String zu None umwandeln
             input_kontaktdaten_key(
-                kontaktdaten, ["kontakt", "strasse"], "> Strasse (ohne Hausnummer): ")
-
-        if "hausnummer" not in kontaktdaten["kontakt"] and command == "search":
-            input_kontaktdaten_key(
-                kontaktdaten, ["kontakt", "hausnummer"], "> Hausnummer: ")
-
-        if "plz" not in kontaktdaten["kontakt"] and command == "search":
+                kontaktdaten, ["zeitrahmen", "bis_uhrzeit"],
+                "> Bis Uhrzeit (Leer lassen zum Überspringen): ",
+                lambda x: x if x else None)  # Leeren String zu None umwandeln
+            print(
+                "Trage nun die Wochentage ein, an denen die ausgewählten Impftermine liegen dürfen.\n"
+                "Mehrere Wochentage können durch Komma getrennt werden.\n"
+                "Beispiel: Mo, Di, Mi, Do, Fr, Sa, So\n"
+                "Leer lassen, um alle Wochentage auszuwählen.")
             input_kontaktdaten_key(
-                kontaktdaten, ["kontakt", "plz"], "> PLZ des Wohnorts: ")
+                kontaktdaten, ["zeitrahmen", "wochentage"],
+                "> Erlaubte Wochentage: ", parse_wochentage)
+        print()
 
-        if "ort" not in kontaktdaten["kontakt"] and command == "search":
-            input_kontaktdaten_key(
-                kontaktdaten, ["kontakt", "ort"], "> Wohnort: ")
+    # Erst nach vollständiger Eingabe speichern, damit bei einem Abbruch die
+    # bisherigen Kontaktdaten erhalten bleiben.
+    speichere_kontaktdaten(filepath, kontaktdaten)
 
-        if "phone" not in kontaktdaten["kontakt"]:
-            input_kontaktdaten_key(
-                kontaktdaten,
-                ["kontakt", "phone"],
-                "> Telefonnummer: +49",
-                lambda x: x if x.startswith("+49") else f"+49{remove_prefix(x, '0')}")
+    return kontaktdaten
 
-        if "notificationChannel" not in kontaktdaten["kontakt"]:
-            kontaktdaten["kontakt"]["notificationChannel"] = "email"
 
-        if "notificationReceiver" not in kontaktdaten["kontakt"]:
-            input_kontaktdaten_key(
-                kontaktdaten, ["kontakt", "notificationReceiver"], "> Mail: ")
-
-        if configure_notifications:
-            if "notifications" not in kontaktdaten:
-                kontaktdaten["notifications"] = {}
-            if "pushover" not in kontaktdaten["notifications"]:
-                while True:
-                    kontaktdaten["notifications"]["pushover"] = {}
-                    if input("> Benachtigung mit Pushover einrichten? (y/n): ").lower() != "n":
-                        print()
-                        input_kontaktdaten_key(
-                            kontaktdaten, ["notifications", "pushover", "app_token"],
-                            "> Geben Sie den Pushover APP Token ein: ")
-                        input_kontaktdaten_key(
-                            kontaktdaten, ["notifications", "pushover", "user_key"],
-                            "> Geben Sie den Pushover User Key ein: ")
-                        try:
-                            validation_code = str(pushover_validation(kontaktdaten["notifications"]["pushover"]))
-                        except PushoverNotificationError as exc:
-                            print(f"Fehler: {exc}\nBitte versuchen Sie es erneut.")
-                            continue
-                        validation_input = input("Geben Sie den Validierungscode ein:").strip()
-                        if validation_input == validation_code:
-                            break
-                        del kontaktdaten["notifications"]["pushover"]
-                        print("Validierung fehlgeschlagen.")
-                        print()
-                    else:
-                        print()
-                        break
-
-            if "telegram" not in kontaktdaten["notifications"]:
-                while True:
-                    kontaktdaten["notifications"]["telegram"] = {}
-                    if input("> Benachtigung mit Telegram einrichten? (y/n): ").lower() != "n":
-                        print()
-                        input_kontaktdaten_key(
-                            kontaktdaten, ["notifications", "telegram", "api_token"],
-                            "> Geben Sie den Telegram API Token ein: ")
-                        input_kontaktdaten_key(
-                            kontaktdaten, ["notifications", "telegram", "chat_id"],
-                            "> Geben Sie die Telegram Chat ID ein: ")
-                        try:
-                            validation_code = str(telegram_validation(kontaktdaten["notifications"]["telegram"]))
-                        except TelegramNotificationError as exc:
-                            print(f"Fehler: {exc}\nBitte versuchen Sie es erneut.")
-                            continue
-                        validation_input = input("Geben Sie den Validierungscode ein:").strip()
-                        if validation_input == validation_code:
-                            break
-                        del kontaktdaten["notifications"]["telegram"]
-                        print("Validierung fehlgeschlagen.")
-                        print()
-                    else:
-                        print()
-                        break
+def input_notification_channel(kontaktdaten, channel, name, prompts, validation, error):
+    """
+    Interaktive Einrichtung eines Benachrichtigungskanals. Die eingegebenen
+    Zugangsdaten werden erst übernommen, wenn der per Benachrichtigung
+    versendete Validierungscode korrekt eingegeben wurde.
+
+    :param kontaktdaten: Kontaktdaten, in denen "notifications" gesetzt ist
+    :param channel: Key des Kanals in "notifications", z. B. "pushover"
+    :param name: Anzeigename des Kanals, z. B. "Pushover"
+    :param prompts: Tupel aus (Key, Prompt) für die benötigten Zugangsdaten
+    :param validation: Funktion, die einen Validierungscode versendet und zurückgibt
+    :param error: Fehlertyp, den validation beim Versenden werfen kann
+    """
 
-        if "zeitrahmen" not in kontaktdaten and command == "search":
-            kontaktdaten["zeitrahmen"] = {}
-            if input("> Zeitrahmen festlegen? (y/n): ").lower() != "n":
-                print()
-                input_kontaktdaten_key(
-                    kontaktdaten, ["zeitrahmen", "einhalten_bei"],
-                    "> Für welchen Impftermin soll der Zeitrahmen gelten? (1/2/beide): ")
-                input_kontaktdaten_key(
-                    kontaktdaten, ["zeitrahmen", "von_datum"],
-                    "> Von Datum (Leer lassen zum Überspringen): ",
-                    lambda x: x if x else None)  # Leeren String zu None umwandeln
-                input_kontaktdaten_key(
-                    kontaktdaten, ["zeitrahmen", "bis_datum"],
-                    "> Bis Datum (Leer lassen zum Überspringen): ",
-                    lambda x: x if x else None)  # Leeren String zu None umwandeln
-                input_kontaktdaten_key(
-                    kontaktdaten, ["zeitrahmen", "von_uhrzeit"],
-                    "> Von Uhrzeit (Leer lassen zum Überspringen): ",
-                    lambda x: x if x else None)  # Leeren String zu None umwandeln
-                input_kontaktdaten_key(
-                    kontaktdaten, ["zeitrahmen", "bis_uhrzeit"],
-                    "> Bis Uhrzeit (Leer lassen zum Überspringen): ",
-                    lambda x: x if x else None)  # Leeren String zu None umwandeln
-                print(
-                    "Trage nun die Wochentage ein, an denen die ausgewählten Impftermine liegen dürfen.\n"
-                    "Mehrere Wochentage können durch Komma getrennt werden.\n"
-                    "Beispiel: Mo, Di, Mi, Do, Fr, Sa, So\n"
-                    "Leer lassen, um alle Wochentage auszuwählen.")
+    while True:
+        kontaktdaten["notifications"][channel] = {}
+        if input(f"> Benachtigung mit {name} einrichten? (y/n): ").strip() not in _NO_ANSWERS:
+            print()
+            for key, prompt in prompts:
                 input_kontaktdaten_key(
-                    kontaktdaten, ["zeitrahmen", "wochentage"],
-                    "> Erlaubte Wochentage: ", parse_wochentage)
+                    kontaktdaten, ["notifications", channel, key], prompt)
+            try:
+                validation_code = str(validation(kontaktdaten["notifications"][channel]))
+            except error as exc:
+                print(f"Fehler: {exc}\nBitte versuchen Sie es erneut.")
+                continue
+            validation_input = input("Geben Sie den Validierungscode ein:").strip()
+            if validation_input == validation_code:
+                break
+            del kontaktdaten["notifications"][channel]
+            print("Validierung fehlgeschlagen.")
             print()
+        else:
+            print()
+            break
 
-        json.dump(kontaktdaten, file, ensure_ascii=False, indent=4)
 
-    return kontaktdaten
+def parse_kommagetrennt(string):
+    """
+    Zerlegt eine kommagetrennte Eingabe in ihre Einträge, ohne Duplikate und
+    unter Beibehaltung der Reihenfolge.
+    Leere Einträge bleiben erhalten, damit die Validierung sie bemängelt.
+    """
+
+    return list(dict.fromkeys(entry.strip() for entry in string.split(",")))
 
 
 def parse_wochentage(string):
-    wochentage = [wt.strip() for wt in string.split(",")]
     # Leere strings durch "if wt" rausfiltern
-    nums = [decode_wochentag(wt) for wt in wochentage if wt]
+    nums = {decode_wochentag(wt) for wt in map(str.strip, string.split(",")) if wt}
     if not nums:
         # None zurückgeben, damit der Key nicht gesetzt wird.
         # Folglich wird der Default genutzt: Alle Wochentage sind zulässig.
         return None
-    nums = sorted(set(nums))
-    return [encode_wochentag(num) for num in nums]
+    return [encode_wochentag(num) for num in sorted(nums)]
+
+
+def normalize_phone(phone):
+    """
+    Bringt eine Telefonnummer in das Format +49..., z. B.
+    "0176..." -> "+49176...", "176..." -> "+49176..."
+    """
+
+    return _PHONE_PREFIX_PATTERN.sub("+49", phone, count=1)
+
+
+def read_input(prompt):
+    """
+    Wie input(), liest bei umgeleiteter Standardeingabe (z. B. per Pipe)
+    aber direkt zeilenweise aus sys.stdin.
+
+    :raise EOFError: Standardeingabe ist erschöpft
+    """
+
+    if sys.stdin.isatty():
+        return input(prompt)
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
 
 
 def input_kontaktdaten_key(
@@ -230,11 +270,12 @@ def input_kontaktdaten_key(
     key = path[-1]
     while True:
         try:
-            value = transformer(input(prompt).strip())
+            value = transformer(read_input(prompt).strip())
             # Wenn transformer None zurückgibt, setzen wir den Key nicht.
             if value is not None:
                 target[key] = value
-                validate_kontaktdaten(kontaktdaten)
+                # Nur der geänderte Teilbaum muss erneut validiert werden.
+                validate_field(path[:1], kontaktdaten[path[0]])
             break
         except ValidationError as exc:
             print(f"\n{str(exc)}\n")
@@ -254,16 +295,18 @@ def run_search_interactive(kontaktdaten_path, configure_notifications, check_del
     :param configure_notifications: Wird durchgereicht zu update_kontaktdaten_interactive()
     """
 
+    dateiname = os.path.basename(kontaktdaten_path)
+
     print(
         "Bitte trage zunächst deinen Impfcode und deine Kontaktdaten ein.\n"
-        f"Die Daten werden anschließend lokal in der Datei '{os.path.basename(kontaktdaten_path)}' abgelegt.\n"
+        f"Die Daten werden anschließend lokal in der Datei '{dateiname}' abgelegt.\n"
         "Du musst sie zukünftig nicht mehr eintragen.\n")
 
     kontaktdaten = {}
     if os.path.isfile(kontaktdaten_path):
         daten_laden = input(
-            f"> Sollen die vorhandenen Daten aus '{os.path.basename(kontaktdaten_path)}' geladen werden? (y/n): ").lower()
-        if daten_laden.lower() != "n":
+            f"> Sollen die vorhandenen Daten aus '{dateiname}' geladen werden? (y/n): ").strip()
+        if daten_laden not in _NO_ANSWERS:
             kontaktdaten = get_kontaktdaten(kontaktdaten_path)
 
     print()
@@ -304,6 +347,10 @@ def run_search(kontaktdaten, check_delay):
             "Bitte überprüfe, ob sie im korrekten JSON-Format sind oder gebe "
             "deine Daten beim Programmstart erneut ein.\n") from exc
 
+    # Erst hier importieren, da Selenium & Co. nur für die Terminsuche und
+    # Codegenerierung benötigt werden und den Programmstart verlangsamen.
+    from tools.its import ImpfterminService
+
     ImpfterminService.terminsuche(
         codes=codes,
         plz_impfzentren=plz_impfzentren,
@@ -327,17 +374,19 @@ def gen_code_interactive(kontaktdaten_path):
     :param kontaktdaten_path: Pfad zur JSON-Datei mit Kontaktdaten. Default: kontaktdaten.json im aktuellen Ordner
     """
 
+    dateiname = os.path.basename(kontaktdaten_path)
+
     print(
         "Du kannst dir jetzt direkt einen Vermittlungscode erstellen.\n"
         "Dazu benötigst du eine Mailadresse, Telefonnummer und die PLZ deines Impfzentrums.\n"
-        f"Die Daten werden anschließend lokal in der Datei '{os.path.basename(kontaktdaten_path)}' abgelegt.\n"
+        f"Die Daten werden anschließend lokal in der Datei '{dateiname}' abgelegt.\n"
         "Du musst sie zukünftig nicht mehr eintragen.\n")
 
     kontaktdaten = {}
     if os.path.isfile(kontaktdaten_path):
         daten_laden = input(
-            f"> Sollen die vorhandenen Daten aus '{os.path.basename(kontaktdaten_path)}' geladen werden (y/n)?: ").lower()
-        if daten_laden.lower() != "n":
+            f"> Sollen die vorhandenen Daten aus '{dateiname}' geladen werden (y/n)?: ").strip()
+        if daten_laden not in _NO_ANSWERS:
             kontaktdaten = get_kontaktdaten(kontaktdaten_path)
 
     print()
@@ -356,15 +405,15 @@ def gen_code(kontaktdaten):
     try:
         plz_impfzentrum = kontaktdaten["plz_impfzentren"][0]
         mail = kontaktdaten["kontakt"]["notificationReceiver"]
-        telefonnummer = kontaktdaten["kontakt"]["phone"]
-        if not telefonnummer.startswith("+49"):
-            telefonnummer = f"+49{remove_prefix(telefonnummer, '0')}"
+        telefonnummer = normalize_phone(kontaktdaten["kontakt"]["phone"])
     except KeyError as exc:
         raise ValueError(
             "Kontaktdaten konnten nicht aus 'kontaktdaten.json' geladen werden.\n"
             "Bitte überprüfe, ob sie im korrekten JSON-Format sind oder gebe "
             "deine Daten beim Programmstart erneut ein.\n") from exc
 
+    from tools.its import ImpfterminService
+
     its = ImpfterminService([], {}, PATH)
 
     # Einmal Chrome starten, um früh einen Fehler zu erzeugen, falls die
@@ -417,6 +466,9 @@ def subcommand_code(args):
 
 
 def subcommand_install_chromium():
+    from tools.chromium_downloader import check_chromium, download_chromium, \
+        check_webdriver, download_webdriver, current_platform
+
     # Mac_Arm currently not working
     if current_platform() == 'mac-arm':
         print('Zur Zeit kann keine eigene Chromium Instanz auf einem Mac M1 installiert werden.')
@@ -429,6 +481,36 @@ def subcommand_install_chromium():
             download_webdriver()
 
 
+def get_latest_version_cached():
+    """
+    Gibt die neuste Version von vaccipy zurück.
+    Das Ergebnis der Abfrage bei GitHub wird für UPDATE_CHECK_TTL Sekunden in
+    data/.update_check.json zwischengespeichert, damit nicht bei jedem
+    Programmstart eine Netzwerkanfrage nötig ist.
+    """
+
+    cache_path = os.path.join(PATH, "data", ".update_check.json")
+    try:
+        if time.time() - os.path.getmtime(cache_path) < UPDATE_CHECK_TTL:
+            with open(cache_path, encoding='utf-8') as file:
+                return json.load(file)["latest"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    latest_version = get_latest_version()
+
+    try:
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({"latest": latest_version}, file)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Cache ist optional, beim nächsten Start wird erneut abgefragt.
+        pass
+
+    return latest_version
+
+
 def validate_args(args):
     """
     Raises ValueError if args contain invalid settings.
@@ -439,6 +521,45 @@ def validate_args(args):
             "--configure-only und --read-only kann nicht gleichzeitig verwendet werden")
 
 
+def toggle_arg(args, name):
+    """
+    Gibt eine Kopie von args zurück, in der die Option name umgeschaltet ist.
+
+    :raise ValueError: Die resultierenden args sind ungültig
+    """
+
+    new_args = argparse.Namespace(**vars(args))
+    setattr(new_args, name, not getattr(new_args, name))
+    validate_args(new_args)
+    print(
+        f"--{name.replace('_', '-')} {'de' if not getattr(new_args, name) else ''}aktiviert.")
+    return new_args
+
+
+def set_retry_sec(args):
+    args.retry_sec = int(input("> --retry-sec="))
+    if args.retry_sec<30:
+        print("[RETRY-SEC] Um die Server nicht übermäßig zu belasten, wurde der Wert auf 30 Sekunden gesetzt")
+        args.retry_sec = 30
+
+
+# Optionen des interaktiven Menüs. Jeder Handler bekommt die aktuellen args
+# und gibt ggf. geänderte args zurück.
+_MENU_OPTIONS = {
+    "1": subcommand_search,
+    "2": subcommand_code,
+    "3": lambda args: subcommand_install_chromium(),
+}
+
+# Nur verfügbar, wenn die erweiterten Einstellungen angezeigt werden
+_EXTENDED_MENU_OPTIONS = {
+    "c": lambda args: toggle_arg(args, "configure_only"),
+    "r": lambda args: toggle_arg(args, "read_only"),
+    "s": set_retry_sec,
+    "n": lambda args: toggle_arg(args, "configure_notifications"),
+}
+
+
 def main():
     create_missing_dirs(PATH)
 
@@ -480,18 +601,19 @@ def main():
         parents=[base_subparser],
         help="Vermittlungscode generieren")
 
+    # Defaults auch ohne bzw. für Subcommands, denen einzelne Optionen fehlen
+    # (z. B. --retry-sec bei "code").
+    parser.set_defaults(
+        file=None,
+        configure_only=False,
+        read_only=False,
+        retry_sec=60,
+        configure_notifications=False)
+
     args = parser.parse_args()
 
-    if not hasattr(args, "file") or args.file is None:
-        args.file = os.path.join(PATH, "data/kontaktdaten.json")
-    if not hasattr(args, "configure_only"):
-        args.configure_only = False
-    if not hasattr(args, "read_only"):
-        args.read_only = False
-    if not hasattr(args, "retry_sec"):
-        args.retry_sec = 60
-    if not hasattr(args, "configure_notifications"):
-        args.configure_notifications = False
+    if args.file is None:
+        args.file = DEFAULT_KONTAKTDATEN_PATH
 
     try:
         validate_args(args)
@@ -532,42 +654,17 @@ def main():
             print()
 
             try:
-                if option == "1":
-                    subcommand_search(args)
-                elif option == "2":
-                    subcommand_code(args)
-                elif option == "3":
-                    subcommand_install_chromium()
-                elif option == "x":
+                if option == "x":
                     extended_settings = not extended_settings
-                elif extended_settings and option == "c":
-                    new_args = copy.copy(args)
-                    new_args.configure_only = not new_args.configure_only
-                    validate_args(new_args)
-                    args = new_args
-                    print(
-                        f"--configure-only {'de' if not args.configure_only else ''}aktiviert.")
-                elif extended_settings and option == "r":
-                    new_args = copy.copy(args)
-                    new_args.read_only = not new_args.read_only
-                    validate_args(new_args)
-                    args = new_args
-                    print(
-                        f"--read-only {'de' if not args.read_only else ''}aktiviert.")
-                elif extended_settings and option == "s":
-                    args.retry_sec = int(input("> --retry-sec="))
-                    if args.retry_sec<30:
-                        print("[RETRY-SEC] Um die Server nicht übermäßig zu belasten, wurde der Wert auf 30 Sekunden gesetzt")
-                        args.retry_sec = 30
-                elif extended_settings and option == "n":
-                    new_args = copy.copy(args)
-                    new_args.configure_notifications = not new_args.configure_notifications
-                    validate_args(new_args)
-                    args = new_args
-                    print(
-                        f"--configure-notifications {'de' if not args.configure_notifications else ''}aktiviert.")
                 else:
-                    print("Falscheingabe! Bitte erneut versuchen.")
+                    handler = _MENU_OPTIONS.get(option)
+                    if handler is None and extended_settings:
+                        handler = _EXTENDED_MENU_OPTIONS.get(option)
+                    if handler is None:
+                        print("Falscheingabe! Bitte erneut versuchen.")
+                    else:
+                        # Handler geben geänderte args zurück, sonst None
+                        args = handler(args) or args
                 print()
             except TypeError as exc:
                 if str(exc) == "expected str, bytes or os.PathLike object, not NoneType":
@@ -597,12 +694,14 @@ if __name__ == "__main__":
 
     # Auf aktuelle Version prüfen
     try:
-        if not update_available():
-            print('Du verwendest die aktuellste Version von vaccipy: ' + get_current_version())
+        current_version = get_current_version()
+        latest_version = get_latest_version_cached()
+        if latest_version.strip() == current_version.strip():
+            print('Du verwendest die aktuellste Version von vaccipy: ' + current_version)
         else:
             print("Du verwendest eine alte Version von vaccipy.\n"
                   "Bitte installiere die aktuellste Version. Link zum Download:\n"
-                  "https://github.com/iamnotturner/vaccipy/releases/tag/" + get_latest_version())
+                  "https://github.com/iamnotturner/vaccipy/releases/tag/" + latest_version)
     except:
         print("vaccipy konnte nicht auf die neuste Version geprüft werden.")
 
@@ -1,5 +1,4 @@
 import os
-import json
 import platform
 from typing import Optional
 
@@ -7,6 +6,8 @@ from PyQt5 import QtWidgets, uic
 from PyQt5.QtWidgets import QMessageBox
 from PyQt5.Qt import QUrl, QDesktopServices
 
+from tools.kontaktdaten import speichere_kontaktdaten
+
 
 def oeffne_file_dialog_save(parent_widged: QtWidgets.QWidget, titel: str, standard_speicherpfad: str, dateityp="JSON Files (*.json)") -> str:
     """
@@ -81,15 +82,14 @@ def oeffne_file_dialog_select(parent_widged: QtWidgets.QWidget, titel: str, stan
 
 def speichern(speicherpfad: str, data: dict):
     """
-    Speichert die Daten mittels json.dump an den entsprechenden Ort
+    Speichert die Daten als JSON an den entsprechenden Ort
 
     Args:
         speicherpfad (str): speicherort
         data (dict): Speicherdaten
     """
 
-    with open(speicherpfad, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    speichere_kontaktdaten(speicherpfad, data)
 
 
 def open_browser(url: str):
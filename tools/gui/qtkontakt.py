@@ -1,15 +1,15 @@
 import os
+import re
+import time
 
 from PyQt5 import QtWidgets, uic
-from PyQt5.QtCore import QEvent, QTime, QDate, QDateTime, pyqtSignal
+from PyQt5.QtCore import Qt, QEvent, QObject, QRunnable, QThreadPool, QTime, QDate, QDateTime, QSignalBlocker, pyqtSignal
 from PyQt5.QtGui import QIcon
 
 from tools.gui import *
-from tools.gui.qtimpfzentren import QtImpfzentren
 from tools import kontaktdaten as kontakt_tools
 from tools import Modus
 from tools.exceptions import ValidationError, MissingValuesError, PushoverNotificationError, TelegramNotificationError
-from tools.utils import pushover_notification, telegram_notification
 
 # Folgende Widgets stehen zur Verfügung:
 
@@ -70,9 +70,74 @@ from tools.utils import pushover_notification, telegram_notification
 # b_impfzentren_waehlen
 # b_test_pushover
 # b_test_telegram
+# b_test_alle
 
 PATH = os.path.dirname(os.path.realpath(__file__))
 
+# Trennt kommagetrennte PLZ inkl. umgebender Leerzeichen
+_PLZ_TRENNER = re.compile(r"\s*,\s*")
+
+# Sekunden, die ein erfolgreicher Test mit unveränderten Zugangsdaten gültig bleibt
+_TEST_CACHE_TTL = 30
+
+# Hosts der Benachrichtigungen, zu denen beim Öffnen des Dialogs vorab verbunden wird
+_VORWAERM_URLS = {
+    'pushover': 'https://api.pushover.net/1/messages.json',
+    'telegram': 'https://api.telegram.org/',
+}
+
+
+def _verbindung_aufbauen(url: str, session):
+    """
+    Baut über eine HEAD-Anfrage eine Keep-Alive Verbindung im Pool der Session auf
+    """
+
+    session.head(url, timeout=3)
+
+
+class BenachrichtigungsSignale(QObject):
+    """
+    Signale eines BenachrichtigungsTest, da QRunnable selbst keine Signale besitzen kann
+    """
+
+    # Signal wenn Test erfolgreich
+    erfolg = pyqtSignal()
+    # Signal wenn Test fehlgeschlagen, übergibt den Fehler
+    fehlschlag = pyqtSignal(Exception)
+    # Signal wenn Test abgeschlossen, unabhängig vom Ergebnis
+    beendet = pyqtSignal()
+
+
+class BenachrichtigungsTest(QRunnable):
+    """
+    Sendet eine Test-Benachrichtigung in einem Thread des QThreadPool
+    Fehler werden nicht geworfen, sondern über das Signal fehlschlag übergeben
+    """
+
+    def __init__(self, funktion, *args, **kwargs):
+        """
+        Args:
+            funktion: Funktion, welche die Benachrichtigung sendet
+            *args: Argumente für funktion
+            **kwargs: Keyword-Argumente für funktion
+        """
+        super().__init__()
+
+        self.funktion = funktion
+        self.args = args
+        self.kwargs = kwargs
+        self.signale = BenachrichtigungsSignale()
+
+    def run(self):
+        try:
+            self.funktion(*self.args, **self.kwargs)
+        except Exception as error:
+            self.signale.fehlschlag.emit(error)
+        else:
+            self.signale.erfolg.emit()
+        finally:
+            self.signale.beendet.emit()
+
 
 class QtKontakt(QtWidgets.QDialog):
 
@@ -86,12 +151,25 @@ class QtKontakt(QtWidgets.QDialog):
         # Setze Attribute
         self.standard_speicherpfad = standard_speicherpfad
         self.modus = modus
+        # Serialisierte Kontaktdaten der letzten erfolgreichen Prüfung
+        self._zuletzt_gueltig = None
+        # Wird beim ersten Test einer Benachrichtigung erstellt
+        self._http_session = None
+        # Zeitpunkt (time.monotonic) des letzten erfolgreichen Tests je Kanal und Zugangsdaten
+        self._test_cache = {}
+        # Anzahl der laufenden Tests je Kanal, bestimmt welche Test-Buttons aktiv sind
+        self._laufende_tests = {'pushover': 0, 'telegram': 0}
+        # Verbindungen werden nur beim ersten Anzeigen vorab aufgebaut
+        self._vorgewaermt = False
 
         # Laden der .ui Datei und init config
         uic.loadUi(pfad_fenster_layout, self)
         self.setWindowIcon(QIcon(os.path.join(ROOT_PATH, "images/spritze.ico")))
         self.setup()
 
+        # Warnung einmalig erstellen, __oeffne_error setzt nur noch die Texte
+        self._error_box = self.__erstelle_error_box()
+
         # Funktionen der ButtonBox zuordnen
         self.buttonBox.clicked.connect(self.__button_box_clicked)
 
@@ -99,6 +177,12 @@ class QtKontakt(QtWidgets.QDialog):
         self.b_impfzentren_waehlen.clicked.connect(self.__open_impfzentren)
         self.b_test_pushover.clicked.connect(self.__test_pushover)
         self.b_test_telegram.clicked.connect(self.__test_telegram)
+        self.b_test_alle.clicked.connect(self.__test_alle)
+        self._test_buttons = {'pushover': self.b_test_pushover, 'telegram': self.b_test_telegram}
+
+        # Offene Verbindungen schließen, sobald der Dialog beendet wird
+        # (Speichern, Abbrechen oder Fenster schließen)
+        self.finished.connect(self.__schliesse_http_session)
 
         # Versuche Kontakdaten zu laden 
         self.__lade_alle_werte()
@@ -110,11 +194,33 @@ class QtKontakt(QtWidgets.QDialog):
             self.tabWidget.setCurrentIndex(0)
 
         # Erstelle Events für LineEdits
-        for line_edit in self.vermittlungscodes_tab.findChildren(QtWidgets.QLineEdit):
+        for line_edit in self._code_line_edits:
             line_edit.installEventFilter(self)
         
         self.i_plz_wohnort.installEventFilter(self)
 
+    def showEvent(self, event):
+        """
+        Baut beim ersten Anzeigen im Hintergrund die Verbindungen zu den angegebenen
+        Benachrichtigungsdiensten auf, damit der erste Test ohne TCP- und TLS-Handshake auskommt.
+        Fehler werden ignoriert, die Verbindung wird dann beim Test aufgebaut.
+
+        Args:
+            event: QShowEvent
+        """
+
+        super().showEvent(event)
+
+        if self._vorgewaermt or self.modus != Modus.TERMIN_SUCHEN:
+            return
+        self._vorgewaermt = True
+
+        # Nur Dienste kontaktieren, für die der User Daten hinterlegt hat
+        for kanal in self.__get_notifications():
+            test = BenachrichtigungsTest(_verbindung_aufbauen, _VORWAERM_URLS[kanal],
+                                         session=self.__get_http_session())
+            QThreadPool.globalInstance().start(test)
+
     def eventFilter(self, source: QtWidgets, event: QEvent) -> bool:
         """
         Filtert Events (z.B. Eingabe in QLineEdit) um auf diese zu reagieren
@@ -128,15 +234,17 @@ class QtKontakt(QtWidgets.QDialog):
 
         """
 
-        if source in self.vermittlungscodes_tab.findChildren(QtWidgets.QLineEdit):
-            if event.type() == QEvent.KeyPress and source.text() == '--':
-                source.setCursorPosition(0)
-                return False
+        # Nur Tastatureingaben sind relevant, alle anderen Events (Fokus,
+        # Maus, Paint, ...) direkt durchreichen
+        if event.type() != QEvent.KeyPress:
+            return False
 
-        if source == self.i_plz_wohnort:
-            if event.type() == QEvent.KeyPress and source.text() == '':
+        if source is self.i_plz_wohnort:
+            if not source.text():
+                source.setCursorPosition(0)
+        elif source in self._code_line_edits_set:
+            if source.text() == '--':
                 source.setCursorPosition(0)
-                return False
 
         return False
 
@@ -148,6 +256,27 @@ class QtKontakt(QtWidgets.QDialog):
             RuntimeError: Modus ungültig
         """
 
+        # Kind-Widgets einmalig suchen, der Widget-Baum ändert sich nach
+        # uic.loadUi nicht mehr
+        self._code_line_edits = self.vermittlungscodes_tab.findChildren(QtWidgets.QLineEdit)
+        self._code_line_edits_set = set(self._code_line_edits)
+        self._all_widgets = self.findChildren(QtWidgets.QWidget)
+        # Eingabefelder beginnen mit "i_", siehe Liste oben
+        self._eingabe_widgets = [widget for widget in self._all_widgets if widget.objectName().startswith("i_")]
+        self._notif_line_edits = self.notifications_tab.findChildren(QtWidgets.QLineEdit)
+        self._zeitrahmen_checkboxes = self.zeitrahmen_tab.findChildren(QtWidgets.QCheckBox)
+        self._zeitrahmen_dateedits = self.zeitrahmen_tab.findChildren(QtWidgets.QDateEdit)
+        self._zeitrahmen_timeedits = self.zeitrahmen_tab.findChildren(QtWidgets.QTimeEdit)
+        self._wochentag_checkboxes = {
+            "Mo": self.i_mo_check_box,
+            "Di": self.i_di_check_box,
+            "Mi": self.i_mi_check_box,
+            "Do": self.i_do_check_box,
+            "Fr": self.i_fr_check_box,
+            "Sa": self.i_sa_check_box,
+            "So": self.i_so_check_box,
+        }
+
         # Startdatum setzten auf heute
         self.i_start_datum_qdate.setMinimumDateTime(QDateTime.currentDateTime())
 
@@ -158,14 +287,9 @@ class QtKontakt(QtWidgets.QDialog):
             # Benötigt wird: PLZ's der Impfzentren, Telefonnummer, Mail
             # Alles andere wird daher deaktiviert
 
-            self.readonly_alle_line_edits(("i_plz_impfzentren", "i_telefon", "i_mail"))
-
-            self.disable_all_dateEdits()
-            self.disable_all_timeEdits()
-            self.disable_all_checkBoxes()
-            self.disable_all_comboBoxes()
             # '' sind alle Standard-Buttons e.g. Save, Reset
-            self.disable_all_buttons(['', 'b_impfzentren_waehlen'])
+            self.deaktiviere_widgets(frozenset({"i_plz_impfzentren", "i_telefon", "i_mail"}),
+                                     frozenset({'', 'b_impfzentren_waehlen'}))
 
         else:
             raise RuntimeError("Modus ungueltig!")
@@ -279,8 +403,7 @@ class QtKontakt(QtWidgets.QDialog):
         notifications = self.__get_notifications()
 
         # PLZ der Zentren in Liste und "strippen"
-        plz_zentren = plz_zentrum_raw.split(",")
-        plz_zentren = [plz.strip() for plz in plz_zentren]
+        plz_zentren = _PLZ_TRENNER.split(plz_zentrum_raw.strip())
 
 
         if self.modus == Modus.TERMIN_SUCHEN:
@@ -293,37 +416,36 @@ class QtKontakt(QtWidgets.QDialog):
             wohnort = self.i_wohnort.text().strip()
             plz_wohnort = self.i_plz_wohnort.text().strip()
 
-            kontaktdaten = {
+            kontakt = {
+                "anrede": anrede,
+                "vorname": vorname,
+                "nachname": nachname,
+                "strasse": strasse,
+                "hausnummer": hausnummer,
+                "plz": plz_wohnort,
+                "ort": wohnort,
+                "phone": telefon,
+                "notificationChannel": "email",
+                "notificationReceiver": mail
+            }
+            return {
                 "plz_impfzentren": plz_zentren,
                 "codes": codes,
-                "kontakt": {
-                    "anrede": anrede,
-                    "vorname": vorname,
-                    "nachname": nachname,
-                    "strasse": strasse,
-                    "hausnummer": hausnummer,
-                    "plz": plz_wohnort,
-                    "ort": wohnort,
-                    "phone": telefon,
-                    "notificationChannel": "email",
-                    "notificationReceiver": mail
-                },
+                "kontakt": kontakt,
                 "notifications": notifications,
                 "zeitrahmen": self.__get_zeitrahmen()
             }
 
-            return kontaktdaten
-
-        kontaktdaten = {
+        kontakt = {
+            "phone": telefon,
+            "notificationChannel": "email",
+            "notificationReceiver": mail
+        }
+        return {
             "plz_impfzentren": plz_zentren,
-            "kontakt": {
-                "phone": telefon,
-                "notificationChannel": "email",
-                "notificationReceiver": mail
-            },
+            "kontakt": kontakt,
             "notifications": notifications,
         }
-        return kontaktdaten
 
     def __check_werte(self, kontaktdaten: dict):
         """
@@ -338,15 +460,45 @@ class QtKontakt(QtWidgets.QDialog):
             MissingValuesError: Daten Fehlen
         """
 
+        # Unveränderte Daten wurden bereits erfolgreich geprüft
+        serialisiert = kontakt_tools.dump_kontaktdaten(kontaktdaten)
+        if serialisiert == self._zuletzt_gueltig:
+            return
+
         kontakt_tools.check_kontaktdaten(kontaktdaten, self.modus)
         kontakt_tools.validate_kontaktdaten(kontaktdaten)
+        self._zuletzt_gueltig = serialisiert
 
 
     def __lade_alle_werte(self):
         """
-        Lädt alle Kontaktdaten und den Suchzeitraum in das GUI
+        Lädt alle Kontaktdaten und den Suchzeitraum in das GUI.
+        Signale der Eingabefelder und das Neuzeichnen sind währenddessen gesperrt.
+        """
+
+        self.setUpdatesEnabled(False)
+        blocker = [QSignalBlocker(widget) for widget in self._eingabe_widgets]
+        try:
+            fehler = self.__setze_alle_werte()
+        finally:
+            for signal_blocker in blocker:
+                signal_blocker.unblock()
+            self.setUpdatesEnabled(True)
+            self.update()
+
+        # Warnung erst anzeigen, wenn der Dialog wieder neu gezeichnet wird
+        if fehler is not None:
+            self.__oeffne_error(**fehler)
+
+    def __setze_alle_werte(self):
+        """
+        Schreibt die Kontaktdaten aus der Datei in die Eingabefelder
+
+        Returns:
+            dict: Argumente für __oeffne_error, falls ein Fehler aufgetreten ist, sonst None
         """
 
+        fehler = None
         try:
             kontaktdaten = kontakt_tools.get_kontaktdaten(self.standard_speicherpfad)
 
@@ -354,31 +506,33 @@ class QtKontakt(QtWidgets.QDialog):
                 # ToDo: Evtl. Meldung anzeigen
                 return
             
-            kontakt_tools.check_kontaktdaten(kontaktdaten, Modus.CODE_GENERIEREN)
-            kontakt_tools.validate_kontaktdaten(kontaktdaten)
-
-            self.i_plz_impfzentren.setText(self.__get_impfzentren_plz(kontaktdaten["plz_impfzentren"]))
-            self.i_telefon.setText(kontaktdaten["kontakt"]["phone"])
-            self.i_mail.setText(kontaktdaten["kontakt"]["notificationReceiver"])
-            
-            # Versuche alle Werte zu laden, wenn möglich
+            # Validiert wurden die Daten bereits von get_kontaktdaten.
+            # Die Terminsuche benötigt alle Werte der Codegenerierung, daher
+            # muss letztere nur geprüft werden, wenn Werte der Terminsuche fehlen.
             try:
                 kontakt_tools.check_kontaktdaten(kontaktdaten, Modus.TERMIN_SUCHEN)
-                kontakt_tools.validate_kontaktdaten(kontaktdaten)
-            except MissingValuesError as exc:
-                return
-            except ValidationError as exc:
+                vollstaendig = True
+            except MissingValuesError:
+                kontakt_tools.check_kontaktdaten(kontaktdaten, Modus.CODE_GENERIEREN)
+                vollstaendig = False
+
+            self.i_plz_impfzentren.setText(self.__get_impfzentren_plz(kontaktdaten["plz_impfzentren"]))
+            kontakt = kontaktdaten["kontakt"]
+            self.i_telefon.setText(kontakt["phone"])
+            self.i_mail.setText(kontakt["notificationReceiver"])
+
+            if not vollstaendig:
                 return
-            
+
             # Wird nur bei Terminsuche benötigt
             self.__set_vermittlungscodes(kontaktdaten["codes"])
-            self.i_anrede_combo_box.setEditText(kontaktdaten["kontakt"]["anrede"])
-            self.i_vorname.setText(kontaktdaten["kontakt"]["vorname"])
-            self.i_nachname.setText(kontaktdaten["kontakt"]["nachname"])
-            self.i_strasse.setText(kontaktdaten["kontakt"]["strasse"])
-            self.i_hausnummer.setText(kontaktdaten["kontakt"]["hausnummer"])
-            self.i_plz_wohnort.setText(kontaktdaten["kontakt"]["plz"])
-            self.i_wohnort.setText(kontaktdaten["kontakt"]["ort"])
+            self.i_anrede_combo_box.setEditText(kontakt["anrede"])
+            self.i_vorname.setText(kontakt["vorname"])
+            self.i_nachname.setText(kontakt["nachname"])
+            self.i_strasse.setText(kontakt["strasse"])
+            self.i_hausnummer.setText(kontakt["hausnummer"])
+            self.i_plz_wohnort.setText(kontakt["plz"])
+            self.i_wohnort.setText(kontakt["ort"])
 
             # Prüfen ob neuer key in kontaktdaten exisitiert
             if "notifications" in kontaktdaten:
@@ -391,18 +545,17 @@ class QtKontakt(QtWidgets.QDialog):
 
             except ValueError:
                 self.__reset_zeitrahmen()
-                self.__oeffne_error(title="Kontaktdaten", text="Falscher Suchzeitraum",
-                                info= "Der Suchzeitraum Ihrer Kontaktdaten ist fehlerhaft."
-                                      " Überprüfen Sie die Daten im Reiter Zeitrahmen und"
-                                      " speichern Sie die Kontaktdaten.")
-                pass
+                fehler = dict(title="Kontaktdaten", text="Falscher Suchzeitraum",
+                              info= "Der Suchzeitraum Ihrer Kontaktdaten ist fehlerhaft."
+                                    " Überprüfen Sie die Daten im Reiter Zeitrahmen und"
+                                    " speichern Sie die Kontaktdaten.")
          
         except MissingValuesError as exc:
             self.__reset_vermittlungscodes()
             self.__reset_kontakdaten()
             self.__reset_zeitrahmen()
             self.__reset_notifications()
-            self.__oeffne_error(title="Kontaktdaten", text="Falsches Format",
+            fehler = dict(title="Kontaktdaten", text="Falsches Format",
                 info= "Die von Ihnen gewählte Datei hat ein falsches Format. "
                        "Laden Sie eine andere Datei oder überschreiben Sie die "
                        "Datei, indem Sie auf Speichern klicken.")
@@ -412,13 +565,14 @@ class QtKontakt(QtWidgets.QDialog):
             self.__reset_kontakdaten()
             self.__reset_zeitrahmen()
             self.__reset_notifications()
-            self.__oeffne_error(title="Kontaktdaten", text="Falsches Format",
+            fehler = dict(title="Kontaktdaten", text="Falsches Format",
                 info= "Die von Ihnen gewählte Datei hat ein falsches Format. "
                        "Laden Sie eine andere Datei oder überschreiben Sie die "
                        "Datei, indem Sie auf Speichern klicken.")
 
         # Wechsel auf den ersten Reiter
         self.tabWidget.setCurrentIndex(0)
+        return fehler
 
 
 
@@ -434,6 +588,8 @@ class QtKontakt(QtWidgets.QDialog):
         Öffnet den Dialog um PLZ auszuwählen
         """
 
+        from tools.gui.qtimpfzentren import QtImpfzentren
+
         impfzentren_dialog = QtImpfzentren(self)
         impfzentren_dialog.update_impfzentren_plz.connect(self.__set_impzentren_plz)
         impfzentren_dialog.show()
@@ -449,106 +605,50 @@ class QtKontakt(QtWidgets.QDialog):
 
         self.i_plz_impfzentren.setText(plz)
 
-    def readonly_alle_line_edits(self, ausgeschlossen: list=list()):
-        """
-        Setzt alle QLineEdit auf "read only", ausgeschlossen der Widgets in ausgeschlossen.
-        Setzt zudem den PlacholderText auf "Daten werden nicht benötigt"
-
-        Args:
-            ausgeschlossen (list): Liste mit den ObjectNamen der Widgets die ausgeschlossen werden sollen
-        """
-
-        line_edits = self.findChildren(QtWidgets.QLineEdit)
-
-        for line_edit in line_edits:
-            if line_edit.objectName() not in ausgeschlossen:
-                line_edit.setReadOnly(True)
-                line_edit.setPlaceholderText("Daten werden nicht benötigt")
-                line_edit.setEnabled(False)
-
-
-    def disable_all_checkBoxes(self, ausgeschlossen: list=list()):
-        """
-        Setzt alle QCheckBox auf "disabled", ausgeschlossen der Widgets in ausgeschlossen.
-
-        Args:
-            ausgeschlossen (list): Liste mit den ObjectNamen der Widgets die ausgeschlossen werden sollen
-        """
-
-        checkBoxes = self.findChildren(QtWidgets.QCheckBox)
-
-        for checkBox in checkBoxes:
-            if checkBox.objectName() not in ausgeschlossen:
-                checkBox.setEnabled(False)
-
-    def disable_all_dateEdits(self, ausgeschlossen: list=list()):
+    def deaktiviere_widgets(self, line_edits_ausgeschlossen: frozenset = frozenset(),
+                            buttons_ausgeschlossen: frozenset = frozenset()):
         """
-        Setzt alle QDateEdit auf "disabled", ausgeschlossen der Widgets in ausgeschlossen.
+        Setzt in einem Durchlauf alle QLineEdit auf "read only" und alle QCheckBox, QDateEdit,
+        QTimeEdit, QComboBox und QPushButton auf "disabled", ausgeschlossen der Widgets in
+        line_edits_ausgeschlossen bzw. buttons_ausgeschlossen.
+        Setzt bei den QLineEdit zudem den PlacholderText auf "Daten werden nicht benötigt"
 
         Args:
-            ausgeschlossen (list): Liste mit den ObjectNamen der Widgets die ausgeschlossen werden sollen
+            line_edits_ausgeschlossen (frozenset): ObjectNamen der QLineEdit die ausgeschlossen werden sollen
+            buttons_ausgeschlossen (frozenset): ObjectNamen der QPushButton die ausgeschlossen werden sollen
         """
 
-        dateEdits = self.findChildren(QtWidgets.QDateEdit)
+        # Beliebige Iterables zulassen, Prüfung im Durchlauf per Hash
+        line_edits_ausgeschlossen = frozenset(line_edits_ausgeschlossen)
+        buttons_ausgeschlossen = frozenset(buttons_ausgeschlossen)
 
-        for dateEdit in dateEdits:
-            if dateEdit.objectName() not in ausgeschlossen:
-                dateEdit.setEnabled(False)
-
-
-    def disable_all_timeEdits(self, ausgeschlossen: list=list()):
-        """
-        Setzt alle QTimeEdit auf "disabled", ausgeschlossen der Widgets in ausgeschlossen.
-
-        Args:
-            ausgeschlossen (list): Liste mit den ObjectNamen der Widgets die ausgeschlossen werden sollen
-        """
-
-        timeEdits = self.findChildren(QtWidgets.QTimeEdit)
-
-        for timeEdit in timeEdits:
-            if timeEdit.objectName() not in ausgeschlossen:
-                timeEdit.setEnabled(False)           
-
-    def disable_all_comboBoxes(self, ausgeschlossen: list=list()):
-        """
-        Setzt alle QComboBox auf "disabled", ausgeschlossen der Widgets in ausgeschlossen.
-
-        Args:
-            ausgeschlossen (list): Liste mit den ObjectNamen der Widgets die ausgeschlossen werden sollen
-        """
-
-        comboBoxes = self.findChildren(QtWidgets.QComboBox)
-
-        for comboBox in comboBoxes:
-            if comboBox.objectName() not in ausgeschlossen:
-                comboBox.setEnabled(False)
-
-    def disable_all_buttons(self, ausgeschlossen: list=list()):
-        """
-        Setzt alle QPushButtons auf "disabled", ausgeschlossen der Widgets in ausgeschlossen.
-
-        Args:
-            ausgeschlossen (list): Liste mit den ObjectNamen der Widgets die ausgeschlossen werden sollen
-        """
-
-        pushButtons = self.findChildren(QtWidgets.QPushButton)
-
-        for pushButton in pushButtons:
-            if pushButton.objectName() not in ausgeschlossen:
-                pushButton.setEnabled(False)
+        for widget in self._all_widgets:
+            if isinstance(widget, QtWidgets.QLineEdit):
+                if widget.objectName() not in line_edits_ausgeschlossen:
+                    widget.setReadOnly(True)
+                    widget.setPlaceholderText("Daten werden nicht benötigt")
+                    widget.setEnabled(False)
+            elif isinstance(widget, QtWidgets.QPushButton):
+                if widget.objectName() not in buttons_ausgeschlossen:
+                    widget.setEnabled(False)
+            elif isinstance(widget, (QtWidgets.QCheckBox, QtWidgets.QDateEdit, QtWidgets.QTimeEdit,
+                                     QtWidgets.QComboBox)):
+                widget.setEnabled(False)
 
     def __reset_kontakdaten(self):
         """
         Setzt alle Werte für die Kontaktdaten in der GUI zurück
         """
 
+        line_edits = []
         for widget in self.kontaktdaten_tab.children():
             if isinstance(widget, QtWidgets.QLineEdit):
-                widget.setText("")
+                line_edits.append(widget)
             elif isinstance(widget, QtWidgets.QComboBox):
                 widget.setCurrentText("Bitte Wählen")
 
+        self.__leere_line_edits(line_edits)
+
         # Telefon wieder mit Prefix befüllen
         self.i_telefon.setText("+49")
 
@@ -557,9 +657,26 @@ class QtKontakt(QtWidgets.QDialog):
         Setzt alle Werte für die Vermittlungscodes in der GUI zurück
         """
 
-        line_edits = self.vermittlungscodes_tab.findChildren(QtWidgets.QLineEdit)
-        for line_edit in line_edits:
-                line_edit.setText("")
+        self.__leere_line_edits(self._code_line_edits)
+
+    def __leere_line_edits(self, line_edits: list):
+        """
+        Leert die übergebenen QLineEdits, ohne dass deren Signale (z.B. textChanged)
+        für jedes einzelne Feld ausgelöst werden.
+        Der vorherige Zustand bleibt erhalten, bereits gesperrte Signale
+        (z.B. während __lade_alle_werte) bleiben gesperrt.
+
+        Args:
+            line_edits (list): QLineEdits die geleert werden sollen
+        """
+
+        vorher = [line_edit.blockSignals(True) for line_edit in line_edits]
+        try:
+            for line_edit in line_edits:
+                line_edit.clear()
+        finally:
+            for line_edit, gesperrt in zip(line_edits, vorher):
+                line_edit.blockSignals(gesperrt)
 
     def __get_impfzentren_plz(self, plzList : list) -> str: 
         """
@@ -572,10 +689,7 @@ class QtKontakt(QtWidgets.QDialog):
             String mit allen PLZ der Impfzentren
 
         """
-        plz_zentrum_raw = ''
-        for plz in plzList:
-            plz_zentrum_raw += plz + ', '
-        return plz_zentrum_raw[:-2]
+        return ", ".join(plzList)
 
     def __get_vermittlungscodes(self) -> list:
         """
@@ -586,14 +700,9 @@ class QtKontakt(QtWidgets.QDialog):
             Liste mit allen vollständigen Vermittlungscodes
 
         """
-        codes = []
-        line_edits = self.vermittlungscodes_tab.findChildren(QtWidgets.QLineEdit)
-        for line_edit in line_edits:
-            code = line_edit.text()
-            # Nur wenn Code nicht leer ist hinzufügen
-            if code != "--":
-                codes.append(line_edit.text())
-        return codes
+        codes = (line_edit.text() for line_edit in self._code_line_edits)
+        # Nur wenn Code nicht leer ist hinzufügen
+        return [code for code in codes if code != "--"]
 
     def __set_vermittlungscodes(self, codes: list):
         """
@@ -603,10 +712,8 @@ class QtKontakt(QtWidgets.QDialog):
             codes: List der codes
 
         """
-        line_edits = self.vermittlungscodes_tab.findChildren(QtWidgets.QLineEdit)
-        line_edits = line_edits[:len(codes)]
-
-        for code, line_edit in zip(codes, line_edits):
+        # zip endet mit der kürzeren Sequenz, überzählige Felder bleiben leer
+        for code, line_edit in zip(codes, self._code_line_edits):
             line_edit.setText(code)
 
 
@@ -624,15 +731,15 @@ class QtKontakt(QtWidgets.QDialog):
         """
 
         aktive_wochentage = self.__get_aktive_wochentage()
-        uhrzeiten = self.__get_uhrzeiten()
         termine = self.__get_aktive_termine()
-        start_datum = self.i_start_datum_qdate.date()
 
         if termine:
+            # Formatierung übernimmt Qt, Gegenstück zu fromString in
+            # __set_start_datum bzw. __set_uhrzeit_datum
             return {
-                "von_datum": f"{start_datum.day()}.{start_datum.month()}.{start_datum.year()}",
-                "von_uhrzeit": f"{uhrzeiten['startzeit']['h']}:{uhrzeiten['startzeit']['m']}",
-                "bis_uhrzeit": f"{uhrzeiten['endzeit']['h']}:{uhrzeiten['endzeit']['m']}",
+                "von_datum": self.i_start_datum_qdate.date().toString("d.M.yyyy"),
+                "von_uhrzeit": self.i_start_time_qtime.time().toString("H:m"),
+                "bis_uhrzeit": self.i_end_time_qtime.time().toString("H:m"),
                 "wochentage": aktive_wochentage,
                 "einhalten_bei": "beide" if len(termine) > 1 else str(termine[0]),
             }
@@ -647,42 +754,7 @@ class QtKontakt(QtWidgets.QDialog):
             list: Alle aktiven Wochentage
         """
 
-        # Leere liste
-        aktive_wochentage = list()
-
-        # Alle Checkboxen der GUI selektieren und durchgehen
-        checkboxes = self.tage_frame.findChildren(QtWidgets.QCheckBox)
-        for num, checkboxe in enumerate(checkboxes, 0):
-            if checkboxe.isChecked():
-                aktive_wochentage.append(checkboxe.property("weekday"))
-
-        return aktive_wochentage
-
-    def __get_uhrzeiten(self) -> dict:
-        """
-        Erstellt ein Dict mit ensprechenden start und endzeiten
-
-        Raises:
-            ValueError: start uhrzeit < end uhrzeit
-
-        Returns:
-            dict: fertiges dict zum speichern mit startzeit und endzeit
-        """
-
-        start_uhrzeit: QTime = self.i_start_time_qtime.time()
-        end_uhrzeit: QTime = self.i_end_time_qtime.time()
-
-        uhrzeiten = {
-            "startzeit": {
-                "h": start_uhrzeit.hour(),
-                "m": start_uhrzeit.minute()
-            },
-            "endzeit": {
-                "h": end_uhrzeit.hour(),
-                "m": end_uhrzeit.minute()
-            }
-        }
-        return uhrzeiten
+        return [tag for tag, checkbox in self._wochentag_checkboxes.items() if checkbox.isChecked()]
 
     def __get_aktive_termine(self) -> list:
         """
@@ -700,27 +772,23 @@ class QtKontakt(QtWidgets.QDialog):
             aktive_termine.append(2)
         return aktive_termine
 
-    def __reset_zeitrahmen(self, widgets: list = None):
+    def __reset_zeitrahmen(self):
         """
         Setzt alle Werte für den Zeitrahmen in der GUI zurück
         """
 
-        if widgets is None:
-            self.__reset_zeitrahmen(self.zeitrahmen_tab.children())
-            return
+        for checkbox in self._zeitrahmen_checkboxes:
+            checkbox.setChecked(True)
+
+        heute = QDate.currentDate()
+        for date_edit in self._zeitrahmen_dateedits:
+            date_edit.setDate(heute)
 
-        for widget in widgets:
-            if isinstance(widget, QtWidgets.QCheckBox):
-                widget.setChecked(True)
-            elif isinstance(widget, QtWidgets.QDateEdit):
-                widget.setDate(QDateTime.currentDateTime().date())
-            elif isinstance(widget, QtWidgets.QTimeEdit):
-                if widget == self.i_start_time_qtime:
-                    widget.setTime(QTime(0, 1))
-                else:
-                    widget.setTime(QTime(23, 59))
-            elif isinstance(widget, QtWidgets.QFrame):
-                self.__reset_zeitrahmen(widget.children())
+        for time_edit in self._zeitrahmen_timeedits:
+            if time_edit is self.i_start_time_qtime:
+                time_edit.setTime(QTime(0, 1))
+            else:
+                time_edit.setTime(QTime(23, 59))
 
     def __set_zeitrahmen(self, zeitrahmen: dict):
         """
@@ -786,25 +854,10 @@ class QtKontakt(QtWidgets.QDialog):
             wochentage: list mit allen Wochentagen
         """
 
-        alle_wochentage = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
-
-        deaktivere_tage = [tag for tag in alle_wochentage if tag not in wochentage]
+        aktive_tage = set(wochentage)
 
-        for tag in deaktivere_tage:
-            if tag == "Mo":
-                self.i_mo_check_box.setChecked(False)
-            elif tag == "Di":
-                self.i_di_check_box.setChecked(False)
-            elif tag == "Mi":
-                self.i_mi_check_box.setChecked(False)
-            elif tag == "Do":
-                self.i_do_check_box.setChecked(False)
-            elif tag == "Fr":
-                self.i_fr_check_box.setChecked(False)
-            elif tag == "Sa":
-                self.i_sa_check_box.setChecked(False)
-            elif tag == "So":
-                self.i_so_check_box.setChecked(False)
+        for tag, checkbox in self._wochentag_checkboxes.items():
+            checkbox.setChecked(tag in aktive_tage)
 
     def __set_start_datum(self, von_datum: str):
         """
@@ -850,28 +903,39 @@ class QtKontakt(QtWidgets.QDialog):
             Dict mit den notifications Werten
         """
 
-        # Pushover
-        app_token = self.i_app_token.text().strip()
-        user_key = self.i_user_key.text().strip()
-
-        # Telegram
-        api_token = self.i_api_token.text().strip()
-        chat_id = self.i_chat_id.text().strip()
+        pushover = self.__get_pushover_daten()
+        telegram = self.__get_telegram_daten()
 
         notifications = {}
 
-        if app_token != "" and user_key != "":
-            notifications['pushover'] = {}
-            notifications['pushover']['app_token'] = app_token
-            notifications['pushover']['user_key'] = user_key
+        if pushover['app_token'] and pushover['user_key']:
+            notifications['pushover'] = pushover
 
-        if api_token != "" and chat_id != "":
-            notifications['telegram'] = {}
-            notifications['telegram']['api_token'] = api_token
-            notifications['telegram']['chat_id'] = chat_id
+        if telegram['api_token'] and telegram['chat_id']:
+            notifications['telegram'] = telegram
 
         return notifications
 
+    def __get_pushover_daten(self) -> dict:
+        """
+        Liest die aktuellen Zugangsdaten für Pushover aus der GUI
+
+        Returns:
+            dict: app_token und user_key
+        """
+
+        return {'app_token': self.i_app_token.text().strip(), 'user_key': self.i_user_key.text().strip()}
+
+    def __get_telegram_daten(self) -> dict:
+        """
+        Liest die aktuellen Zugangsdaten für Telegram aus der GUI
+
+        Returns:
+            dict: api_token und chat_id
+        """
+
+        return {'api_token': self.i_api_token.text().strip(), 'chat_id': self.i_chat_id.text().strip()}
+
     def __set_notifications(self, notifications: dict):
         """
         Werte aus übergebenem Dict werden in die passenden QLineEdits geschrieben
@@ -893,34 +957,195 @@ class QtKontakt(QtWidgets.QDialog):
         Setzt alle Werte für die Benachrichtigungen (notifications) in der GUI zurück
         """
 
-        for line_edit in self.notifications_tab.findChildren(QtWidgets.QLineEdit):
-                line_edit.setText("")
+        self.__leere_line_edits(self._notif_line_edits)
 
     def __test_pushover(self):
         """
         Benutzt die Werte aus der GUI um eine Test-Benachrichtigung mit Pushover zu senden
         """
 
-        notifications = {'app_token': self.i_app_token.text().strip(), 'user_key': self.i_user_key.text().strip()}
-        try:
-            pushover_notification(notifications, "Vaccipy", "Die Benachrichtigungsfunktion funktioniert!")
-        except PushoverNotificationError as error:
-            self.__oeffne_error("Pushover Fehler",
-                                "Vermutlich sind die Daten nicht korrekt, versuchen Sie es erneut.",
-                                str(error))
+        self.__test_kanal('pushover', "Pushover Fehler")
 
     def __test_telegram(self):
         """
         Benutzt die Werte aus der GUI um eine Test-Benachrichtigung mit Telegram zu senden
         """
 
-        notifications = {'api_token': self.i_api_token.text().strip(), 'chat_id': self.i_chat_id.text().strip()}
-        try:
-            telegram_notification(notifications, "Vaccipy - Die Benachrichtigungsfunktion funktioniert!")
-        except TelegramNotificationError as error:
-            self.__oeffne_error("Telegram Fehler",
-                                "Vermutlich sind die Daten nicht korrekt, versuchen Sie es erneut.",
-                                str(error))
+        self.__test_kanal('telegram', "Telegram Fehler")
+
+    def __test_kanal(self, kanal: str, fehler_titel: str):
+        """
+        Sendet eine Test-Benachrichtigung für einen einzelnen Kanal
+
+        Args:
+            kanal: 'pushover' oder 'telegram'
+            fehler_titel: Titel der Warnung, falls der Test fehlschlägt
+        """
+
+        gestartet = self.__starte_test(kanal, lambda error: self.__zeige_test_fehler(fehler_titel, error),
+                                       lambda: None)
+        if not gestartet:
+            self.__zeige_bereits_getestet(self._test_buttons[kanal])
+
+    def __test_alle(self):
+        """
+        Sendet für alle vollständig angegebenen Benachrichtigungen gleichzeitig eine Test-Benachrichtigung.
+        Kanäle, die mit denselben Zugangsdaten bereits erfolgreich getestet wurden, werden übersprungen.
+        Fehlgeschlagene Tests werden gesammelt in einer Warnung angezeigt.
+        """
+
+        kanaele = self.__get_notifications()
+        if not kanaele:
+            self.__oeffne_error("Benachrichtigungen", "Keine Benachrichtigungen angegeben.",
+                                "Bitte geben Sie die Daten für Pushover und/oder Telegram vollständig an.")
+            return
+
+        ausstehend = [0]
+        fehler = []
+
+        def test_beendet():
+            ausstehend[0] -= 1
+            if not ausstehend[0] and fehler:
+                self.__oeffne_error("Benachrichtigungen Fehler",
+                                    "Folgende Test-Benachrichtigungen sind fehlgeschlagen, versuchen Sie es erneut.",
+                                    "\n".join(fehler))
+
+        # Alle Tests direkt nacheinander starten, ohne auf das Ergebnis zu warten
+        for kanal in kanaele:
+            name = kanal.capitalize()
+            if self.__starte_test(kanal, lambda error, name=name: fehler.append(f"{name}: {error}"),
+                                  test_beendet):
+                ausstehend[0] += 1
+
+        if not ausstehend[0]:
+            self.__zeige_bereits_getestet(self.b_test_alle)
+
+    def __starte_test(self, kanal: str, fehlschlag_slot, beendet_slot) -> bool:
+        """
+        Sendet eine Test-Benachrichtigung im QThreadPool, damit die GUI während der Anfrage nicht hängt.
+        War ein Test mit denselben Zugangsdaten vor weniger als _TEST_CACHE_TTL Sekunden erfolgreich,
+        wird keine erneute Anfrage gesendet.
+        Solange der Test läuft, zählt er in _laufende_tests, siehe __aktualisiere_test_buttons.
+
+        Args:
+            kanal: 'pushover' oder 'telegram'
+            fehlschlag_slot: Wird mit dem Fehler aufgerufen, falls der Test fehlschlägt
+            beendet_slot: Wird nach dem Test aufgerufen, falls dieser gestartet wurde
+
+        Returns:
+            bool: False, falls der Test wegen eines vorherigen Erfolgs übersprungen wurde
+        """
+
+        from tools.utils import pushover_notification, telegram_notification
+
+        if kanal == 'pushover':
+            notifications = self.__get_pushover_daten()
+            funktion = pushover_notification
+            args = (notifications, "Vaccipy", "Die Benachrichtigungsfunktion funktioniert!")
+        else:
+            notifications = self.__get_telegram_daten()
+            funktion = telegram_notification
+            args = (notifications, "Vaccipy - Die Benachrichtigungsfunktion funktioniert!")
+
+        test_key = (kanal, *notifications.values())
+        if time.monotonic() - self._test_cache.get(test_key, float('-inf')) < _TEST_CACHE_TTL:
+            return False
+
+        def test_erfolgreich():
+            self._test_cache[test_key] = time.monotonic()
+
+        def test_fehlgeschlagen(error):
+            self._test_cache.pop(test_key, None)
+            fehlschlag_slot(error)
+
+        def test_beendet():
+            self._laufende_tests[kanal] -= 1
+            self.__aktualisiere_test_buttons()
+            beendet_slot()
+
+        self._laufende_tests[kanal] += 1
+        self.__aktualisiere_test_buttons()
+        self.__sende_test(funktion, args, test_fehlgeschlagen, test_beendet, test_erfolgreich)
+        return True
+
+    def __aktualisiere_test_buttons(self):
+        """
+        Setzt die Test-Buttons anhand der laufenden Tests.
+        Ein Kanal-Button ist deaktiviert, solange ein Test des Kanals läuft,
+        b_test_alle solange irgendein Test läuft.
+        """
+
+        for kanal, button in self._test_buttons.items():
+            button.setEnabled(not self._laufende_tests[kanal])
+        self.b_test_alle.setEnabled(not any(self._laufende_tests.values()))
+
+    def __zeige_bereits_getestet(self, button: QtWidgets.QPushButton):
+        """
+        Zeigt am Button einen Hinweis, dass der Test bereits erfolgreich war
+
+        Args:
+            button: Button, der den Test ausgelöst hat
+        """
+
+        QtWidgets.QToolTip.showText(button.mapToGlobal(button.rect().center()),
+                                    "Bereits erfolgreich getestet", button)
+
+    def __sende_test(self, funktion, args: tuple, fehlschlag_slot, beendet_slot, erfolg_slot=None):
+        """
+        Startet einen BenachrichtigungsTest im QThreadPool. Die Slots werden im GUI-Thread ausgeführt.
+
+        Args:
+            funktion: pushover_notification oder telegram_notification
+            args: Argumente für funktion
+            fehlschlag_slot: Wird mit dem Fehler aufgerufen, falls der Test fehlschlägt
+            beendet_slot: Wird nach jedem Test aufgerufen
+            erfolg_slot: Wird aufgerufen, falls der Test erfolgreich war
+        """
+
+        test = BenachrichtigungsTest(funktion, *args, session=self.__get_http_session())
+        if erfolg_slot is not None:
+            test.signale.erfolg.connect(erfolg_slot, Qt.QueuedConnection)
+        test.signale.fehlschlag.connect(fehlschlag_slot, Qt.QueuedConnection)
+        test.signale.beendet.connect(beendet_slot, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(test)
+
+    def __zeige_test_fehler(self, titel: str, error: Exception):
+        """
+        Zeigt eine Warnung für eine fehlgeschlagene Test-Benachrichtigung
+
+        Args:
+            titel: Titel des Fensters
+            error: Fehler aus dem BenachrichtigungsTest
+        """
+
+        if isinstance(error, (PushoverNotificationError, TelegramNotificationError)):
+            text = "Vermutlich sind die Daten nicht korrekt, versuchen Sie es erneut."
+        else:
+            text = "Die Benachrichtigung konnte nicht gesendet werden, versuchen Sie es erneut."
+        self.__oeffne_error(titel, text, str(error))
+
+    def __get_http_session(self):
+        """
+        Gibt die Session für die Test-Benachrichtigungen zurück, erstellt diese beim ersten Aufruf.
+        Weitere Tests nutzen so die bestehende Verbindung zu Pushover bzw. Telegram.
+
+        Returns:
+            requests.Session: Session des Dialogs
+        """
+
+        if self._http_session is None:
+            from tools.utils import create_notification_session
+            self._http_session = create_notification_session()
+        return self._http_session
+
+    def __schliesse_http_session(self):
+        """
+        Schließt die Session der Test-Benachrichtigungen, falls vorhanden
+        """
+
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
 
     def __oeffne_error(self, title: str, text: str, info: str):
         """
@@ -932,12 +1157,29 @@ class QtKontakt(QtWidgets.QDialog):
                 info: Infotext der Warnung
         """
         try:
-            msg = QtWidgets.QMessageBox(self)
-            msg.setIcon(QtWidgets.QMessageBox.Warning)
+            # Ist die Warnung bereits offen (z.B. zwei fehlgeschlagene Tests),
+            # wird für die weitere Meldung eine eigene Warnung erstellt
+            zusaetzlich = self._error_box.isVisible()
+            msg = self.__erstelle_error_box() if zusaetzlich else self._error_box
             msg.setWindowTitle(title)
             msg.setText(text)
             msg.setInformativeText(info)
-            msg.addButton(msg.Close)
             msg.exec_()
-        except Exception as error:
-            pass
+            if zusaetzlich:
+                msg.deleteLater()
+        except RuntimeError:
+            # Dialog bzw. Warnung wurde bereits von Qt gelöscht (z.B. beim Beenden)
+            return
+
+    def __erstelle_error_box(self) -> QtWidgets.QMessageBox:
+        """
+        Erstellt eine Warnung mit Close-Button für __oeffne_error
+
+        Returns:
+            QtWidgets.QMessageBox: Warnung ohne Texte
+        """
+
+        msg = QtWidgets.QMessageBox(self)
+        msg.setIcon(QtWidgets.QMessageBox.Warning)
+        msg.addButton(QtWidgets.QMessageBox.Close)
+        return msg
@@ -1,10 +1,19 @@
 import datetime
 import json
+import os
 import re
 from email.utils import parseaddr
+from functools import lru_cache
 from tools.exceptions import ValidationError, MissingValuesError
 from tools import Modus
 
+try:
+    import orjson
+
+    ENABLE_ORJSON = True
+except ImportError:
+    ENABLE_ORJSON = False
+
 
 WOCHENTAG_ABBRS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
 WOCHENTAG_NAMES = [
@@ -16,11 +25,31 @@ WOCHENTAG_NAMES = [
     "Samstag",
     "Sonntag"]
 
+# Alle zulässigen Schreibweisen (Präfixe ab zwei Zeichen, klein geschrieben)
+# mit zugehörigem Index, z. B. "mo", "mon", ..., "montag" -> 0
+_WOCHENTAG_INDIZES = {
+    name.lower()[:length]: num
+    for num, name in enumerate(WOCHENTAG_NAMES)
+    for length in range(2, len(name) + 1)}
+
+_CODE_PATTERN = re.compile(r"^[0-9a-zA-Z]{4}-[0-9a-zA-Z]{4}-[0-9a-zA-Z]{4}$")
+_PLZ_PATTERN = re.compile(r"^[0-9]{5}$")
+_PHONE_PATTERN = re.compile(r"^\+49[1-9][0-9]+$")
+_TELEGRAM_API_TOKEN_PATTERN = re.compile(r"\w+:\w+")
+
+# Bereits gelesene Kontaktdaten je Dateipfad:
+# {filepath: ((st_mtime_ns, st_size), kontaktdaten)}
+_KONTAKTDATEN_CACHE = {}
+
 
 def get_kontaktdaten(filepath: str):
     """
     Lade Kontaktdaten aus Datei.
 
+    Solange sich die Datei nicht ändert, wird sie nicht erneut gelesen und
+    validiert, sondern eine Kopie des zwischengespeicherten Ergebnisses
+    zurückgegeben.
+
     :param filepath: Pfad zur JSON-Datei mit Kontaktdaten.
     :return: Dictionary mit Kontaktdaten
 
@@ -28,24 +57,94 @@ def get_kontaktdaten(filepath: str):
     """
 
     try:
-        with open(filepath, encoding='utf-8') as f:
-            try:
-                kontaktdaten = json.load(f)
-
-                # Backwards Compatibility: "code"
-                if "code" in kontaktdaten:
-                    code = kontaktdaten.pop("code")
-                    if "codes" not in kontaktdaten:
-                        kontaktdaten["codes"] = []
-                    kontaktdaten["codes"].append(code)
-
-                validate_kontaktdaten(kontaktdaten)
-                return kontaktdaten
-            except json.JSONDecodeError:
-                return {}
+        fingerprint = _get_fingerprint(filepath)
+        cached = _KONTAKTDATEN_CACHE.get(filepath)
+        if cached is not None and cached[0] == fingerprint:
+            kontaktdaten = cached[1]
+        else:
+            kontaktdaten = _lade_kontaktdaten(filepath)
+            _KONTAKTDATEN_CACHE[filepath] = (fingerprint, kontaktdaten)
     except FileNotFoundError:
         return {}
 
+    # Kopie zurückgeben, damit Änderungen des Aufrufers den Cache nicht
+    # verfälschen.
+    return _loads(dump_kontaktdaten(kontaktdaten))
+
+
+def speichere_kontaktdaten(filepath: str, kontaktdaten: dict):
+    """
+    Speichert Kontaktdaten in eine Datei.
+    Geschrieben wird zunächst in eine temporäre Datei, damit bei einem Fehler
+    die bisherigen Kontaktdaten erhalten bleiben.
+    Der Cache von get_kontaktdaten wird verworfen, beim nächsten Aufruf werden
+    die Daten neu eingelesen und validiert.
+
+    :param filepath: Pfad zur JSON-Datei mit Kontaktdaten.
+    :param kontaktdaten: Dictionary mit Kontaktdaten
+    """
+
+    data = dump_kontaktdaten(kontaktdaten)
+    tmp_filepath = filepath + ".tmp"
+    with open(tmp_filepath, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_filepath, filepath)
+
+    _KONTAKTDATEN_CACHE.pop(filepath, None)
+
+
+def _get_fingerprint(filepath: str):
+    """
+    :raise FileNotFoundError: Datei existiert nicht
+    """
+
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _lade_kontaktdaten(filepath: str):
+    """
+    Liest und validiert die Kontaktdaten-Datei.
+    """
+
+    with open(filepath, 'rb') as f:
+        try:
+            kontaktdaten = _loads(f.read())
+        except json.JSONDecodeError:
+            # orjson.JSONDecodeError ist eine Unterklasse davon
+            return {}
+
+    # Backwards Compatibility: "code"
+    if "code" in kontaktdaten:
+        code = kontaktdaten.pop("code")
+        if "codes" not in kontaktdaten:
+            kontaktdaten["codes"] = []
+        kontaktdaten["codes"].append(code)
+
+    validate_kontaktdaten(kontaktdaten)
+    return kontaktdaten
+
+
+def dump_kontaktdaten(kontaktdaten: dict) -> bytes:
+    """
+    Serialisiert Kontaktdaten als UTF-8-kodiertes JSON mit 2 Leerzeichen Einrückung.
+    Nutzt orjson, falls installiert, ansonsten das json-Modul. Beide erzeugen
+    dasselbe Format, da orjson nur eine Einrückung von 2 Leerzeichen unterstützt.
+
+    :param kontaktdaten: Dictionary mit Kontaktdaten
+    :return: JSON als bytes
+    """
+
+    if ENABLE_ORJSON:
+        return orjson.dumps(kontaktdaten, option=orjson.OPT_INDENT_2)
+    return json.dumps(kontaktdaten, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _loads(data: bytes):
+    if ENABLE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def check_kontaktdaten(kontaktdaten: dict, mode: Modus):
     """
@@ -99,22 +198,49 @@ def validate_kontaktdaten(kontaktdaten: dict):
     if not isinstance(kontaktdaten, dict):
         raise ValidationError("Muss ein Dictionary sein")
 
-    for key, value in kontaktdaten.items():
+    _validate_keys(kontaktdaten, ())
+
+
+def validate_field(path, value):
+    """
+    Validiert einen einzelnen Wert aus den Kontaktdaten, ohne die restlichen
+    Kontaktdaten erneut zu prüfen.
+    Fehlermeldungen entsprechen denen von validate_kontaktdaten.
+
+    :param path: Pfad zum Wert, z. B. ("kontakt", "phone")
+    :param value: Zu validierender Wert
+    :raise ValidationError: Pfad ist unbekannt
+    :raise ValidationError: Wert ist ungültig
+    """
+
+    path = tuple(path)
+    validator = _FIELD_VALIDATORS.get(path)
+    try:
+        if validator is None:
+            raise ValidationError(f"Nicht unterstützter Key")
+        validator(value)
+    except ValidationError as exc:
+        message = str(exc)
+        for key in reversed(path):
+            message = f"Ungültiger Key {json.dumps(key)}:\n{message}"
+        raise ValidationError(message)
+
+
+def _validate_keys(daten: dict, prefix: tuple):
+    """
+    Validiert alle Keys eines Dictionaries mithilfe der Validatoren aus
+    _FIELD_VALIDATORS, die unterhalb von prefix registriert sind.
+
+    :raise ValidationError: Einer der enthaltenen Keys ist unbekannt
+    :raise ValidationError: Eine der enthaltenen Values ist ungültig
+    """
+
+    for key, value in daten.items():
         try:
-            if key == "codes":
-                validate_codes(value)
-            elif key == "plz_impfzentren":
-                validate_plz_impfzentren(value)
-            elif key == "kontakt":
-                validate_kontakt(value)
-            elif key == "notifications":
-                validate_notifications(value)
-            elif key == "zeitrahmen":
-                validate_zeitrahmen(value)
-            elif key == "notifications":
-                validate_notifications(value)
-            else:
+            validator = _FIELD_VALIDATORS.get(prefix + (key,))
+            if validator is None:
                 raise ValidationError(f"Nicht unterstützter Key")
+            validator(value)
         except ValidationError as exc:
             raise ValidationError(
                 f"Ungültiger Key {json.dumps(key)}:\n{str(exc)}")
@@ -138,8 +264,7 @@ def validate_codes(codes: list):
     for code in codes:
         if not isinstance(code, str):
             raise ValidationError("Darf nur Zeichenketten enthalten")
-        c = "[0-9a-zA-Z]"
-        if not re.match(f"^{4 * c}-{4 * c}-{4 * c}$", code):
+        if not _CODE_PATTERN.match(code):
             raise ValidationError(
                 f"{json.dumps(code)} entspricht nicht dem Schema \"XXXX-XXXX-XXXX\"")
 
@@ -177,7 +302,7 @@ def validate_plz(plz: str):
     if not isinstance(plz, str):
         raise ValidationError("Muss eine Zeichenkette sein")
 
-    if not re.match(f"^{5 * '[0-9]'}$", plz):
+    if not _PLZ_PATTERN.match(plz):
         raise ValidationError(
             f"Ungültige PLZ {json.dumps(plz)} - muss aus genau 5 Ziffern bestehen")
 
@@ -195,29 +320,26 @@ def validate_kontakt(kontakt: dict):
     if not isinstance(kontakt, dict):
         raise ValidationError("Muss ein Dictionary sein")
 
-    for key, value in kontakt.items():
-        try:
-            if key in ["anrede", "vorname", "nachname", "strasse", "ort"]:
-                if not isinstance(value, str):
-                    raise ValidationError("Muss eine Zeichenkette sein")
-                if value.strip() == "":
-                    raise ValidationError(f"Darf nicht leer sein")
-            elif key == "plz":
-                validate_plz(value)
-            elif key == "hausnummer":
-                validate_hausnummer(value)
-            elif key == "phone":
-                validate_phone(value)
-            elif key == "notificationChannel":
-                if value != "email":
-                    raise ValidationError("Muss auf \"email\" gesetzt werden")
-            elif key == "notificationReceiver":
-                validate_email(value)
-            else:
-                raise ValidationError(f"Nicht unterstützter Key")
-        except ValidationError as exc:
-            raise ValidationError(
-                f"Ungültiger Key {json.dumps(key)}:\n{str(exc)}")
+    _validate_keys(kontakt, ("kontakt",))
+
+
+def _validate_nicht_leer(value: str):
+    """
+    Validiert eine Zeichenkette auf: Typ, "leer"
+
+    :raise ValidationError: Typ ist nicht str
+    :raise ValidationError: Zeichenkette ist leer
+    """
+
+    if not isinstance(value, str):
+        raise ValidationError("Muss eine Zeichenkette sein")
+    if value.strip() == "":
+        raise ValidationError(f"Darf nicht leer sein")
+
+
+def _validate_notification_channel(notification_channel: str):
+    if notification_channel != "email":
+        raise ValidationError("Muss auf \"email\" gesetzt werden")
 
 
 def validate_phone(phone: str):
@@ -235,7 +357,7 @@ def validate_phone(phone: str):
     if not isinstance(phone, str):
         raise ValidationError("Muss eine Zeichenkette sein")
 
-    if not re.match(r"^\+49[1-9][0-9]+$", phone):
+    if not _PHONE_PATTERN.match(phone):
         raise ValidationError(
             f"Ungültige Telefonnummer {json.dumps(phone)}")
 
@@ -276,7 +398,7 @@ def validate_email(email: str):
         raise ValidationError("Muss eine Zeichenkette sein")
 
     # https://stackoverflow.com/a/14485817/7350842
-    parsed_email = parseaddr(email)[1]
+    parsed_email = _parse_email(email)
     if '@' not in parsed_email:
         raise ValidationError(f"Ungültige E-Mail-Adresse {json.dumps(email)}")
 
@@ -287,6 +409,16 @@ def validate_email(email: str):
             f"Ungültige E-Mail-Adresse {json.dumps(email)} (Plus-Zeichen nicht möglich)")
 
 
+@lru_cache(maxsize=256)
+def _parse_email(email: str) -> str:
+    """
+    Extrahiert die Adresse aus einer E-Mail-Angabe. Das Ergebnis wird pro
+    Zeichenkette zwischengespeichert, da parseaddr vergleichsweise teuer ist.
+    """
+
+    return parseaddr(email)[1]
+
+
 def validate_zeitrahmen(zeitrahmen: dict):
     """
     Validiert "zeitrahmen"-Key aus Kontaktdaten.
@@ -308,26 +440,7 @@ def validate_zeitrahmen(zeitrahmen: dict):
         raise ValidationError(
             'Ein gesetzter Zeitrahmen braucht zwingend den Key "einhalten_bei"')
 
-    for key, value in zeitrahmen.items():
-        try:
-            if key in ["von_datum", "bis_datum"]:
-                validate_datum(value)
-            elif key in ["von_uhrzeit", "bis_uhrzeit"]:
-                validate_uhrzeit(value)
-            elif key == "wochentage":
-                if not isinstance(value, list):
-                    raise ValidationError("Muss eine Liste sein")
-                if not value:
-                    raise ValidationError("Darf keine leere Liste sein")
-                for weekday in value:
-                    validate_wochentag(weekday)
-            elif key == "einhalten_bei":
-                validate_einhalten_bei(value)
-            else:
-                raise ValidationError(f"Nicht unterstützter Key")
-        except ValidationError as exc:
-            raise ValidationError(
-                f"Ungültiger Key {json.dumps(key)}:\n{str(exc)}")
+    _validate_keys(zeitrahmen, ("zeitrahmen",))
 
     if "von_datum" in zeitrahmen and "bis_datum" in zeitrahmen:
         von_datum = datetime.datetime.strptime(
@@ -354,51 +467,21 @@ def validate_notifications(notifications: dict):
     if not isinstance(notifications, dict):
         raise ValidationError("Muss ein Dictionary sein")
 
-    for key, value in notifications.items():
-        try:
-            if key == "pushover":
-                validate_pushover(value)
-            elif key == "telegram":
-                validate_telegram(value)
-            else:
-                raise ValidationError(f"Nicht unterstützter Key")
-        except ValidationError as exc:
-            raise ValidationError(
-                f"Ungültiger Key {json.dumps(key)}:\n{str(exc)}")
+    _validate_keys(notifications, ("notifications",))
 
 
 def validate_pushover(pushover: dict):
     if not isinstance(pushover, dict):
         raise ValidationError("Muss ein Dictionary sein")
 
-    for key, value in pushover.items():
-        try:
-            if key == "app_token":
-                validate_pushover_app_token(value)
-            elif key == "user_key":
-                validate_pushover_user_key(value)
-            else:
-                raise ValidationError(f"Nicht unterstützter Key")
-        except ValidationError as exc:
-            raise ValidationError(
-                f"Ungültiger Key {json.dumps(key)}:\n{str(exc)}")
+    _validate_keys(pushover, ("notifications", "pushover"))
 
 
 def validate_telegram(telegram: dict):
     if not isinstance(telegram, dict):
         raise ValidationError("Muss ein Dictionary sein")
 
-    for key, value in telegram.items():
-        try:
-            if key == "api_token":
-                validate_telegram_api_token(value)
-            elif key == "chat_id":
-                validate_telegram_chat_id(value)
-            else:
-                raise ValidationError(f"Nicht unterstützter Key")
-        except ValidationError as exc:
-            raise ValidationError(
-                f"Ungültiger Key {json.dumps(key)}:\n{str(exc)}")
+    _validate_keys(telegram, ("notifications", "telegram"))
 
 
 def validate_pushover_app_token(pushover_app_token: str):
@@ -438,7 +521,7 @@ def validate_telegram_api_token(telegram_api_token: str):
 
     if not isinstance(telegram_api_token, str):
         raise ValidationError("Muss eine Zeichenkette sein")
-    if not re.search(r"\w+:\w+", telegram_api_token):
+    if not _TELEGRAM_API_TOKEN_PATTERN.search(telegram_api_token):
         raise ValidationError("Der Telegram API-Token besteht aus zwei Teilen welche durch \":\" getrennt sind.")
 
 
@@ -490,6 +573,15 @@ def validate_uhrzeit(time: str):
         raise ValidationError(str(exc)) from exc
 
 
+def _validate_wochentage(wochentage: list):
+    if not isinstance(wochentage, list):
+        raise ValidationError("Muss eine Liste sein")
+    if not wochentage:
+        raise ValidationError("Darf keine leere Liste sein")
+    for wochentag in wochentage:
+        validate_wochentag(wochentag)
+
+
 def validate_wochentag(wochentag: str):
     """
     Validiert einen Wochentag.
@@ -533,10 +625,7 @@ def decode_wochentag(wochentag: str):
     zwei Zeichen lang sind, z. B. "Mo", "Mon", "Mont", usw.
     """
 
-    num = None
-    if len(wochentag) >= 2:
-        num = next((i for i, wt in enumerate(WOCHENTAG_NAMES)
-                    if wt.lower().startswith(wochentag.lower())), None)
+    num = _WOCHENTAG_INDIZES.get(wochentag.lower())
     if num is None:
         raise ValueError(
             f"Ungültiger Wochentag: {json.dumps(wochentag)}"
@@ -553,3 +642,36 @@ def encode_wochentag(num: int):
     """
 
     return WOCHENTAG_ABBRS[num]
+
+
+# Validatoren je Pfad innerhalb der Kontaktdaten. Wird einmalig beim Import
+# aufgebaut und von validate_kontaktdaten bzw. validate_field genutzt.
+_FIELD_VALIDATORS = {
+    ("codes",): validate_codes,
+    ("plz_impfzentren",): validate_plz_impfzentren,
+    ("kontakt",): validate_kontakt,
+    ("kontakt", "anrede"): _validate_nicht_leer,
+    ("kontakt", "vorname"): _validate_nicht_leer,
+    ("kontakt", "nachname"): _validate_nicht_leer,
+    ("kontakt", "strasse"): _validate_nicht_leer,
+    ("kontakt", "hausnummer"): validate_hausnummer,
+    ("kontakt", "plz"): validate_plz,
+    ("kontakt", "ort"): _validate_nicht_leer,
+    ("kontakt", "phone"): validate_phone,
+    ("kontakt", "notificationChannel"): _validate_notification_channel,
+    ("kontakt", "notificationReceiver"): validate_email,
+    ("notifications",): validate_notifications,
+    ("notifications", "pushover"): validate_pushover,
+    ("notifications", "pushover", "app_token"): validate_pushover_app_token,
+    ("notifications", "pushover", "user_key"): validate_pushover_user_key,
+    ("notifications", "telegram"): validate_telegram,
+    ("notifications", "telegram", "api_token"): validate_telegram_api_token,
+    ("notifications", "telegram", "chat_id"): validate_telegram_chat_id,
+    ("zeitrahmen",): validate_zeitrahmen,
+    ("zeitrahmen", "von_datum"): validate_datum,
+    ("zeitrahmen", "bis_datum"): validate_datum,
+    ("zeitrahmen", "von_uhrzeit"): validate_uhrzeit,
+    ("zeitrahmen", "bis_uhrzeit"): validate_uhrzeit,
+    ("zeitrahmen", "wochentage"): _validate_wochentage,
+    ("zeitrahmen", "einhalten_bei"): validate_einhalten_bei,
+}
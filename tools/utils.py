@@ -8,6 +8,7 @@ from threading import Thread
 
 import requests
 from plyer import notification
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ReadTimeout, ConnectionError, ConnectTimeout
 
 from tools.exceptions import DesktopNotificationError, PushoverNotificationError, TelegramNotificationError
@@ -174,7 +175,21 @@ def get_latest_version():
     return latest_version
 
 
-def pushover_notification(notifications: dict, title: str, message: str):
+def create_notification_session() -> requests.Session:
+    """
+    Erstellt eine requests.Session für wiederholte Benachrichtigungen.
+    Pro Host (Pushover, Telegram) bleibt eine Keep-Alive Verbindung offen,
+    sodass weitere Aufrufe ohne erneuten TCP- und TLS-Handshake auskommen.
+
+    :return: Session, muss vom Aufrufer mit close() geschlossen werden
+    """
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    return session
+
+
+def pushover_notification(notifications: dict, title: str, message: str, session: requests.Session = None):
     if 'app_token' not in notifications or 'user_key' not in notifications:
         return
 
@@ -188,7 +203,8 @@ def pushover_notification(notifications: dict, title: str, message: str):
         'message': message
     }
 
-    r = requests.post(url, data=data)
+    http = session if session is not None else requests
+    r = http.post(url, data=data)
     if r.status_code != 200:
         raise PushoverNotificationError(r.status_code, r.text)
 
@@ -200,7 +216,7 @@ def pushover_validation(notifications: dict):
     return validation_code
 
 
-def telegram_notification(notifications: dict, message: str):
+def telegram_notification(notifications: dict, message: str, session: requests.Session = None):
     if 'api_token' not in notifications or 'chat_id' not in notifications:
         return
 
@@ -216,7 +232,8 @@ def telegram_notification(notifications: dict, message: str):
         'text': message
     }
 
-    r = requests.get(url, params=params, headers=headers)
+    http = session if session is not None else requests
+    r = http.get(url, params=params, headers=headers)
     if r.status_code != 200:
         raise TelegramNotificationError(r.status_code, r.text)
 